@@ -18,29 +18,39 @@ Do NOT import this module directly. Import the flags package and use the
 aliases defined at the package level instead.
 """
 
-from __future__ import absolute_import
-from __future__ import division
-from __future__ import print_function
-
 import csv
 import io
 import string
+import sys
 
 from absl.flags import _helpers
-import six
 
 
-def _is_integer_type(instance):
-  """Returns True if instance is an integer, and not a bool."""
-  return (isinstance(instance, six.integer_types) and
-          not isinstance(instance, bool))
+# Maps the prefixes accepted by IntegerParser to the base they denote.
+_INTEGER_BASE_PREFIXES = {'0o': 8, '0x': 16}
+
+# Types accepted by FloatParser.convert. bool is a subclass of int, so it is
+# rejected separately.
+_FLOAT_CONVERTIBLE_TYPES = (int, float, str)
+
+# Maps the lower-cased strings accepted by BooleanParser to their values.
+_BOOLEAN_STRINGS = {
+    'true': True, 't': True, '1': True,
+    'false': False, 'f': False, '0': False,
+}
+
+# Sentinel for cache misses in _ArgumentParserCache.
+_MISSING = object()
+
+# Shared argument parser instances, keyed by (cls,) + args. A plain dict
+# lookup in _ArgumentParserCache.__call__ is faster on cache hits than routing
+# construction through a functools.lru_cache factory.
+_parser_instances = {}
 
 
 class _ArgumentParserCache(type):
   """Metaclass used to cache and share argument parsers among flags."""
 
-  _instances = {}
-
   def __call__(cls, *args, **kwargs):
     """Returns an instance of the argument parser cls.
 
@@ -62,21 +72,20 @@ class _ArgumentParserCache(type):
     """
     if kwargs:
       return type.__call__(cls, *args, **kwargs)
-    else:
-      instances = cls._instances
-      key = (cls,) + tuple(args)
-      try:
-        return instances[key]
-      except KeyError:
-        # No cache entry for key exists, create a new one.
-        return instances.setdefault(key, type.__call__(cls, *args))
-      except TypeError:
-        # An object in args cannot be hashed, always return
-        # a new instance.
-        return type.__call__(cls, *args)
-
-
-class ArgumentParser(six.with_metaclass(_ArgumentParserCache, object)):
+    key = (cls,) + args
+    try:
+      instance = _parser_instances.get(key, _MISSING)
+    except TypeError:
+      # An object in args cannot be hashed, always return
+      # a new instance.
+      return type.__call__(cls, *args)
+    if instance is _MISSING:
+      # No cache entry for key exists, create a new one.
+      instance = _parser_instances[key] = type.__call__(cls, *args)
+    return instance
+
+
+class ArgumentParser(metaclass=_ArgumentParserCache):
   """Base class used to parse and convert arguments.
 
   The parse() method checks to make sure that the string argument is a
@@ -109,7 +118,7 @@ class ArgumentParser(six.with_metaclass(_ArgumentParserCache, object)):
     Returns:
       The parsed value in native type.
     """
-    if not isinstance(argument, six.string_types):
+    if not isinstance(argument, str):
       raise TypeError('flag value must be a string, found "{}"'.format(
           type(argument)))
     return argument
@@ -142,11 +151,41 @@ class NumericParser(ArgumentParser):
   Parsed value may be bounded to a given upper and lower bound.
   """
 
+  # Maps (lower_bound, upper_bound) pairs that have a one-word description to
+  # that word, e.g. (0, None) -> 'non-negative'.
+  _bound_adjectives = {}
+
   def is_outside_bounds(self, val):
     """Returns whether the value is outside the bounds or not."""
+    # The bounds are read on every call, so later assignments to lower_bound
+    # or upper_bound (e.g. by subclasses after __init__) are honored.
     return ((self.lower_bound is not None and val < self.lower_bound) or
             (self.upper_bound is not None and val > self.upper_bound))
 
+  def _bounds_syntactic_help(self, lower_bound, upper_bound):
+    """Returns the syntactic help describing the given bounds.
+
+    Args:
+      lower_bound: the lower bound of the parsed value, or None.
+      upper_bound: the upper bound of the parsed value, or None.
+
+    Returns:
+      str, the syntactic help, built from the class-level syntactic_help and
+      number_name.
+    """
+    if lower_bound is not None and upper_bound is not None:
+      return '%s in the range [%s, %s]' % (
+          self.syntactic_help, lower_bound, upper_bound)
+    adjective = self._bound_adjectives.get((lower_bound, upper_bound))
+    if adjective is not None:
+      return 'a %s %s' % (adjective, self.number_name)
+    elif upper_bound is not None:
+      return '%s <= %s' % (self.number_name, upper_bound)
+    elif lower_bound is not None:
+      return '%s >= %s' % (self.number_name, lower_bound)
+    else:
+      return self.syntactic_help
+
   def parse(self, argument):
     """See base class."""
     val = self.convert(argument)
@@ -188,33 +227,25 @@ class FloatParser(NumericParser):
   number_article = 'a'
   number_name = 'number'
   syntactic_help = ' '.join((number_article, number_name))
+  _bound_adjectives = {
+      (0, None): 'non-negative',
+      (None, 0): 'non-positive',
+  }
 
   def __init__(self, lower_bound=None, upper_bound=None):
     super(FloatParser, self).__init__()
     self.lower_bound = lower_bound
     self.upper_bound = upper_bound
-    sh = self.syntactic_help
-    if lower_bound is not None and upper_bound is not None:
-      sh = ('%s in the range [%s, %s]' % (sh, lower_bound, upper_bound))
-    elif lower_bound == 0:
-      sh = 'a non-negative %s' % self.number_name
-    elif upper_bound == 0:
-      sh = 'a non-positive %s' % self.number_name
-    elif upper_bound is not None:
-      sh = '%s <= %s' % (self.number_name, upper_bound)
-    elif lower_bound is not None:
-      sh = '%s >= %s' % (self.number_name, lower_bound)
-    self.syntactic_help = sh
+    self.syntactic_help = self._bounds_syntactic_help(lower_bound, upper_bound)
 
   def convert(self, argument):
     """Returns the float value of argument."""
-    if (_is_integer_type(argument) or isinstance(argument, float) or
-        isinstance(argument, six.string_types)):
+    if (isinstance(argument, _FLOAT_CONVERTIBLE_TYPES) and
+        not isinstance(argument, bool)):
       return float(argument)
-    else:
-      raise TypeError(
-          'Expect argument to be a string, int, or float, found {}'.format(
-              type(argument)))
+    raise TypeError(
+        'Expect argument to be a string, int, or float, found {}'.format(
+            type(argument)))
 
   def flag_type(self):
     """See base class."""
@@ -229,40 +260,25 @@ class IntegerParser(NumericParser):
   number_article = 'an'
   number_name = 'integer'
   syntactic_help = ' '.join((number_article, number_name))
+  _bound_adjectives = {
+      (1, None): 'positive',
+      (None, -1): 'negative',
+      (0, None): 'non-negative',
+      (None, 0): 'non-positive',
+  }
 
   def __init__(self, lower_bound=None, upper_bound=None):
     super(IntegerParser, self).__init__()
     self.lower_bound = lower_bound
     self.upper_bound = upper_bound
-    sh = self.syntactic_help
-    if lower_bound is not None and upper_bound is not None:
-      sh = ('%s in the range [%s, %s]' % (sh, lower_bound, upper_bound))
-    elif lower_bound == 1:
-      sh = 'a positive %s' % self.number_name
-    elif upper_bound == -1:
-      sh = 'a negative %s' % self.number_name
-    elif lower_bound == 0:
-      sh = 'a non-negative %s' % self.number_name
-    elif upper_bound == 0:
-      sh = 'a non-positive %s' % self.number_name
-    elif upper_bound is not None:
-      sh = '%s <= %s' % (self.number_name, upper_bound)
-    elif lower_bound is not None:
-      sh = '%s >= %s' % (self.number_name, lower_bound)
-    self.syntactic_help = sh
+    self.syntactic_help = self._bounds_syntactic_help(lower_bound, upper_bound)
 
   def convert(self, argument):
     """Returns the int value of argument."""
-    if _is_integer_type(argument):
+    if isinstance(argument, str):
+      return int(argument, _INTEGER_BASE_PREFIXES.get(argument[:2], 10))
+    elif isinstance(argument, int) and not isinstance(argument, bool):
       return argument
-    elif isinstance(argument, six.string_types):
-      base = 10
-      if len(argument) > 2 and argument[0] == '0':
-        if argument[1] == 'o':
-          base = 8
-        elif argument[1] == 'x':
-          base = 16
-      return int(argument, base)
     else:
       raise TypeError('Expect argument to be a string or int, found {}'.format(
           type(argument)))
@@ -278,11 +294,10 @@ class BooleanParser(ArgumentParser):
   def parse(self, argument):
     """See base class."""
     if isinstance(argument, str):
-      if argument.lower() in ('true', 't', '1'):
-        return True
-      elif argument.lower() in ('false', 'f', '0'):
-        return False
-    elif isinstance(argument, six.integer_types):
+      bool_value = _BOOLEAN_STRINGS.get(argument.lower())
+      if bool_value is not None:
+        return bool_value
+    elif isinstance(argument, int):
       # Only allow bool or integer 0, 1.
       # Note that float 1.0 == True, 0.0 == False.
       bool_value = bool(argument)
@@ -315,6 +330,17 @@ class EnumParser(ArgumentParser):
     super(EnumParser, self).__init__()
     self.enum_values = enum_values
     self.case_sensitive = case_sensitive
+    # Built eagerly: the join is cheap, and a lazy functools.cached_property
+    # would need Python 3.8.
+    self._error_message = 'value should be one of <%s>' % '|'.join(enum_values)
+    if case_sensitive:
+      self._enum_set = frozenset(enum_values)
+    else:
+      # Maps each upper-cased value to the first element of enum_values that
+      # matches it, preserving the "first match wins" behavior of parse().
+      self._upper_map = {}
+      for value in enum_values:
+        self._upper_map.setdefault(value.upper(), value)
 
   def parse(self, argument):
     """Determines validity of argument and returns the correct element of enum.
@@ -329,18 +355,18 @@ class EnumParser(ArgumentParser):
       ValueError: Raised when argument didn't match anything in enum.
     """
     if self.case_sensitive:
-      if argument not in self.enum_values:
-        raise ValueError('value should be one of <%s>' %
-                         '|'.join(self.enum_values))
-      else:
-        return argument
+      try:
+        if argument in self._enum_set:
+          return argument
+      except TypeError:
+        # An unhashable argument can't be in the enum.
+        pass
     else:
-      if argument.upper() not in [value.upper() for value in self.enum_values]:
-        raise ValueError('value should be one of <%s>' %
-                         '|'.join(self.enum_values))
-      else:
-        return [value for value in self.enum_values
-                if value.upper() == argument.upper()][0]
+      try:
+        return self._upper_map[argument.upper()]
+      except KeyError:
+        pass
+    raise ValueError(self._error_message)
 
   def flag_type(self):
     """See base class."""
@@ -354,7 +380,10 @@ class ListSerializer(ArgumentSerializer):
 
   def serialize(self, value):
     """See base class."""
-    return self.list_sep.join([_helpers.str_or_unicode(x) for x in value])
+    # str.join materializes its input anyway, so a list comprehension over a
+    # locally bound converter is cheaper than map() or a generator.
+    str_or_unicode = _helpers.str_or_unicode
+    return self.list_sep.join([str_or_unicode(x) for x in value])
 
 
 class CsvListSerializer(ArgumentSerializer):
@@ -364,16 +393,13 @@ class CsvListSerializer(ArgumentSerializer):
 
   def serialize(self, value):
     """Serializes a list as a CSV string or unicode."""
-    if six.PY2:
-      # In Python2 csv.writer doesn't accept unicode, so we convert to UTF-8.
-      output = io.BytesIO()
-      csv.writer(output).writerow([unicode(x).encode('utf-8') for x in value])
-      serialized_value = output.getvalue().decode('utf-8').strip()
-    else:
-      # In Python3 csv.writer expects a text stream.
-      output = io.StringIO()
-      csv.writer(output).writerow([str(x) for x in value])
-      serialized_value = output.getvalue().strip()
+    # A new buffer and writer per call keeps serializers cheap to construct
+    # and copyable; serialize() itself is rarely on a hot path.
+    output = io.StringIO()
+    # Elements are always converted here: checking their types to skip the
+    # conversion costs as much as the conversion itself.
+    csv.writer(output).writerow([str(x) for x in value])
+    serialized_value = output.getvalue().strip()
 
     # We need the returned value to be pure ascii or Unicodes so that
     # when the xml help is generated they are usefully encodable.
@@ -397,6 +423,7 @@ class BaseListParser(ArgumentParser):
     self._token = token
     self._name = name
     self.syntactic_help = 'a %s separated list' % self._name
+    self._flag_type = sys.intern('%s separated list of strings' % self._name)
 
   def parse(self, argument):
     """See base class."""
@@ -405,11 +432,27 @@ class BaseListParser(ArgumentParser):
     elif not argument:
       return []
     else:
-      return [s.strip() for s in argument.split(self._token)]
+      return self.parse_str(argument)
+
+  def parse_str(self, argument):
+    """Parses a non-empty string argument into a list of strings.
+
+    Unlike parse(), this does not accept lists or empty values; callers that
+    already hold a non-empty string can use it to skip those checks.
+
+    Args:
+      argument: str, a non-empty string argument passed in the commandline.
+
+    Returns:
+      [str], the parsed flag value.
+    """
+    # Splitting with str.split() and stripping each piece is faster than a
+    # fused re.split(r'\s*<token>\s*'), even for long lists.
+    return [s.strip() for s in argument.split(self._token)]
 
   def flag_type(self):
     """See base class."""
-    return '%s separated list of strings' % self._name
+    return self._flag_type
 
 
 class ListParser(BaseListParser):
@@ -418,23 +461,26 @@ class ListParser(BaseListParser):
   def __init__(self):
     super(ListParser, self).__init__(',', 'comma')
 
-  def parse(self, argument):
-    """Parses argument as comma-separated list of strings."""
-    if isinstance(argument, list):
-      return argument
-    elif not argument:
-      return []
-    else:
-      try:
-        return [s.strip() for s in list(csv.reader([argument], strict=True))[0]]
-      except csv.Error as e:
-        # Provide a helpful report for case like
-        #   --listflag="$(printf 'hello,\nworld')"
-        # IOW, list flag values containing naked newlines.  This error
-        # was previously "reported" by allowing csv.Error to
-        # propagate.
-        raise ValueError('Unable to parse the value %r as a %s: %s'
-                         % (argument, self.flag_type(), e))
+  def parse_str(self, argument):
+    """Parses a non-empty argument as comma-separated list of strings."""
+    if (isinstance(argument, str) and
+        '"' not in argument and '\\' not in argument and
+        '\n' not in argument and '\r' not in argument):
+      # Without quotes or line breaks the csv module would split exactly on
+      # commas, so skip it. Separate 'in' tests are much faster here than a
+      # single character-class regex search. Non-str values go through csv,
+      # which reports them as a ValueError below.
+      return [s.strip() for s in argument.split(',')]
+    try:
+      return [s.strip() for s in list(csv.reader([argument], strict=True))[0]]
+    except csv.Error as e:
+      # Provide a helpful report for case like
+      #   --listflag="$(printf 'hello,\nworld')"
+      # IOW, list flag values containing naked newlines.  This error
+      # was previously "reported" by allowing csv.Error to
+      # propagate.
+      raise ValueError('Unable to parse the value %r as a %s: %s'
+                       % (argument, self.flag_type(), e))
 
   def _custom_xml_dom_elements(self, doc):
     elements = super(ListParser, self)._custom_xml_dom_elements(doc)
@@ -458,24 +504,21 @@ class WhitespaceSeparatedListParser(BaseListParser):
     name = 'whitespace or comma' if self._comma_compat else 'whitespace'
     super(WhitespaceSeparatedListParser, self).__init__(None, name)
 
-  def parse(self, argument):
-    """Parses argument as whitespace-separated list of strings.
+  def parse_str(self, argument):
+    """Parses a non-empty argument as whitespace-separated list of strings.
 
     It also parses argument as comma-separated list of strings if requested.
 
     Args:
-      argument: string argument passed in the commandline.
+      argument: str, a non-empty string argument passed in the commandline.
 
     Returns:
       [str], the parsed flag value.
     """
-    if isinstance(argument, list):
-      return argument
-    elif not argument:
-      return []
+    if self._comma_compat:
+      # Two C-level passes; measurably faster than a [\s,]+ regex split.
+      return argument.replace(',', ' ').split()
     else:
-      if self._comma_compat:
-        argument = argument.replace(',', ' ')
       return argument.split()
 
   def _custom_xml_dom_elements(self, doc):
@@ -18,7 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import platform
+import sys
 
 try:
   import setuptools
@@ -27,9 +27,8 @@ except ImportError:
   use_setuptools()
   import setuptools
 
-py_version = platform.python_version_tuple()
-if py_version < ('2', '7') or py_version[0] == '3' and py_version < ('3', '4'):
-  raise RuntimeError('Python version 2.7 or 3.4+ is required.')
+if sys.version_info < (3, 4):
+  raise RuntimeError('Python version 3.4+ is required.')
 
 
 setuptools.setup(
@@ -47,8 +46,6 @@ setuptools.setup(
     license='Apache 2.0',
     classifiers=[
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',